@@ -11,17 +11,15 @@ import numpy as np
 import requests
 
 from extras import AIRMAP_ELEVATION_API_KEY
+# AirMap carpet endpoint and request headers
+url = 'https://api.airmap.com/elevation/v1/ele/carpet?'
+headers = {
+    'X-API-Key': AIRMAP_ELEVATION_API_KEY,
+    'Content-Type': 'application/json; charset=utf-8',
+}
 # query the AirMap elevation API for the given boundary box.
-# returns numpy array with elevaton map.
+# returns contiguous float32 numpy array with elevaton map.
 def heightmapper(bounds:Dict):
-    api_key = AIRMAP_ELEVATION_API_KEY
-    url = 'https://api.airmap.com/elevation/v1/ele/carpet?'
-    
-    headers = {
-        'X-API-Key': api_key,
-        'Content-Type': 'application/json; charset=utf-8',
-    }
-    
     arc_lat = bounds['N'] - bounds['S']
     arc_lon = bounds['E'] - bounds['W']
     # The Airmap Elevation API has a 10.000 data limit, as each data is 1 arcsecond, the limit extent is 100 x 100 = 10.000
@@ -44,7 +42,7 @@ def heightmapper(bounds:Dict):
             res = requests.get(url + params[0] + '=' + params[1], headers=headers)
             if res.ok:
                 data = res.json()['data']
-                tmp_lst.append(np.matrix(data['carpet']))
+                tmp_lst.append(np.asarray(data['carpet'], dtype=np.float32))
                 maxh = data['stats']['max'] if data['stats']['max'] > maxh else maxh
                 minh = data['stats']['min'] if data['stats']['min'] < minh else minh
             else:
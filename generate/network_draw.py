@@ -5,25 +5,20 @@ Created on Thu Apr  1 16:52:21 2021
 @author: joako360
 """
 from download import download_menu, download_data
-from transform import translate_gdf
 import osmnx as ox
 
-tobj = open("roads.tobj","w+")
-tobj.write("// x        y        z    rx  ry rz odefname (without .odef file extension)\n")
-
 data = download_data(*download_menu())
-x_0 = data['x_0']; y_0 = data['y_0']
-nodes=ox.graph_to_gdfs(data['roads'],nodes=True,edges=False)
-nodes_trns=translate_gdf(nodes, x_0, y_0)
-tobj.write("//some roads\n")
+# the roads graph is already projected and shifted to the x_0,y_0 origin by transform_graph
+nodes_trns=ox.graph_to_gdfs(data['roads'],nodes=True,edges=False)
+
+# whole columns at once: x east, y elevation, z north flipped to RoR's axis
+xs=nodes_trns['geometry'].x.tolist()
+ys=nodes_trns['elevation'].astype(float).tolist()
+zs=(-nodes_trns['geometry'].y).tolist()
 
-for index,row in nodes_trns.iterrows():
-    y=float(row['elevation'])
-    coords=str(row['geometry'])[6:]
-    coords=coords.replace('(','').replace(')','')
-    [x,z]=coords.split()
-    x=float(x)
-    z=float(z)*-1.0
-    tobj.write("{}, {}, {}, 0.0, 0.0, 0.0, road-crossing\n".format(str(x),str(y),str(z)))
-    
-tobj.close()
\ No newline at end of file
+line_fmt = "{}, {}, {}, 0.0, 0.0, 0.0, road-crossing\n".format
+# stream lines into a 1 MiB write buffer
+with open("roads.tobj","w",buffering=1<<20) as tobj:
+    tobj.write("// x        y        z    rx  ry rz odefname (without .odef file extension)\n")
+    tobj.write("//some roads\n")
+    tobj.writelines(map(line_fmt,xs,ys,zs))
\ No newline at end of file
@@ -5,10 +5,13 @@ Created on Mon Mar 22 21:06:05 2021
 @author: Joako360
 """
 from collections import OrderedDict
+from hashlib import blake2b
+from os import getpid, path, remove, replace
 from typing import Dict, Tuple
 from extras import AIRMAP_ELEVATION_API_KEY, colors, custom_tags, map_geometries, networks
 from transform import data_from_gdf, transform_gdf, transform_graph
 from networkx import MultiDiGraph
+from shapely.geometry.base import BaseGeometry
 import osmnx as ox
 from osmnx._errors import EmptyOverpassResponse
 
@@ -18,24 +21,56 @@ ox.config(
     useful_tags_way=ox.settings.useful_tags_way + custom_tags)
 ox.__version__
 api_key=AIRMAP_ELEVATION_API_KEY
+network_type="drive_service"
 #custom_filter='["railway"~"tram|rail"]'
-# download graph from OSM with osmnx parameters: place query, wich option and optional custom filters
+# GraphML cache path keyed on the boundary polygon, custom filter and the osmnx settings that shape the graph
 
 
-def download_graph(place_query:str,which=1,cf=None)->MultiDiGraph:
+def graph_cache_path(polygon:BaseGeometry,cf=None)->str:
+    settings = (
+        polygon.wkt,
+        cf,
+        network_type,
+        ox.settings.useful_tags_node,
+        ox.settings.useful_tags_way,
+        ox.settings.elevation_provider,
+    )
+    key = blake2b(repr(settings).encode('utf-8'), digest_size=16).hexdigest()
+    return path.join(ox.settings.cache_folder, 'graphs', key + '.graphml')
+
+# download graph from OSM with osmnx parameters: boundary polygon of the place and optional custom filters
+
+
+def download_graph(polygon:BaseGeometry,cf=None)->MultiDiGraph:
+    filepath = graph_cache_path(polygon, cf)
+    if ox.settings.use_cache and path.isfile(filepath):
+        print("Loading cached graph from {}".format(filepath))
+        try:
+            return ox.load_graphml(filepath)
+        except Exception as e:
+            print("Cached graph is unreadable, downloading it again: {}".format(e))
     try:
-        G = ox.graph_from_place(
-            place_query, 
-            network_type="drive_service", 
+        G = ox.graph_from_polygon(
+            polygon, 
+            network_type=network_type, 
             simplify=False, 
             retain_all=True, 
-            which_result=which, 
             custom_filter=cf
         )
         G = ox.simplify_graph(G)
         G = ox.add_node_elevations(G, api_key=api_key)
         G = ox.add_edge_grades(G)
         G = ox.add_edge_bearings(G)
+        if ox.settings.use_cache:
+            # save beside the final path, then swap it in atomically
+            tmp_filepath = '{}.{}.tmp'.format(filepath, getpid())
+            try:
+                ox.save_graphml(G, tmp_filepath)
+                replace(tmp_filepath, filepath)
+            except OSError as e:
+                print("Could not cache graph in {}: {}".format(filepath, e))
+                if path.isfile(tmp_filepath):
+                    remove(tmp_filepath)
         print("Success!")
         return G
     except ValueError:
@@ -90,25 +125,30 @@ def download_data(place:str, which:int)->Dict:
     if not which:
         return d
     area = ox.geocode_to_gdf(place, which_result=which)
-    d = data_from_gdf(area)
+    # boundary polygon shared by every layer download
+    polygon = area['geometry'].iloc[0]
+    # projected boundary gives the origin in metres and the CRS for every layer
+    area_proj = ox.project_gdf(area)
+    d = data_from_gdf(area_proj)
+    crs = area_proj.crs
     
     x_0 = d['x_0']
     y_0 = d['y_0']
     
     for typ, tag in map_geometries.items():
         print("Acquiring {} areas data".format(typ))
-        gdf = ox.geometries_from_place(place, tag ,which_result=which)
+        gdf = ox.geometries_from_polygon(polygon, tag)
         if not gdf.empty:
-            gdf_trns = transform_gdf(gdf, x_0, y_0)
+            gdf_trns = transform_gdf(gdf, x_0, y_0, to_crs=crs)
             d[typ] = gdf_trns
         else:
             d[typ] = None
         
     for typ, cf in networks.items():
         print("Acquiring {} network data".format(typ))
-        G = download_graph(place, which=which, cf=cf)
+        G = download_graph(polygon, cf=cf)
         if G is not None:
-            G_trns = transform_graph(G, x_0, y_0)
+            G_trns = transform_graph(G, x_0, y_0, to_crs=crs)
             d[typ] = G_trns
             print("Success!")
         else:
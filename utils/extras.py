@@ -32,8 +32,7 @@ map_geometries = {
         },
     'lakes': {
         'natural': 'water',
-        'water': 'lake',
-        'water': 'river',
+        'water': ['lake', 'river'],
         }
     }
 # Dictionary of networks, such as roads, rails or rivers. 
@@ -8,48 +8,55 @@ from math import ceil
 from geopandas import GeoDataFrame
 from networkx import MultiDiGraph
 from osmnx import graph_from_gdfs, graph_to_gdfs, project_graph, project_gdf
-from shapely import affinity
 
 # extract offset, x size, y size, map size and the itself from GeoDataFrame and return dict.
 def data_from_gdf(gdf:GeoDataFrame)->dict:
+    minx, miny, maxx, maxy = gdf.total_bounds
+    x_size = ceil(maxx - minx)
+    y_size = ceil(maxy - miny)
     d = {
-        'x_0': float(gdf.bounds.minx),
-        'y_0': float(gdf.bounds.maxy),
-        'x_size': ceil(gdf.bounds.maxx - gdf.bounds.minx),
-        'y_size': ceil(gdf.bounds.maxy - gdf.bounds.miny),
-        'world_size': ceil(gdf.bounds.maxx - gdf.bounds.minx) * ceil(gdf.bounds.maxy - gdf.bounds.miny),
+        'x_0': float(minx),
+        'y_0': float(maxy),
+        'x_size': x_size,
+        'y_size': y_size,
+        'world_size': x_size * y_size,
         'area': gdf
     }
     return d
 # translate GeoDataFrame with same CRS and bounds to new coordinates with x_0,y_0 as the new origin
+# x_0,y_0 are subtracted, so data already shifted by translate_graph/transform_gdf must not be passed again
 def translate_gdf(gdf:GeoDataFrame, x_0=None, y_0=None)->GeoDataFrame:
-    if x_0 is None: x_0 = gdf.bounds.minx
-    if y_0 is None: y_0 = gdf.bounds.maxy
-    gdf_trns = gdf.copy()
-    gdf_trns = affinity.translate(gdf,xoff=x_0, yoff=y_0)
+    if x_0 is None or y_0 is None:
+        minx, _, _, maxy = gdf.total_bounds
+        if x_0 is None: x_0 = minx
+        if y_0 is None: y_0 = maxy
+    translated = gdf.geometry.translate(xoff=-x_0, yoff=-y_0)
+    gdf_trns = GeoDataFrame(gdf.drop(columns=gdf.geometry.name), geometry=translated, crs=gdf.crs)
     return gdf_trns
 
 
-def translate_graph(G:MultiDiGraph,x_0:float,y_0:float)->MultiDiGraph:  #networks use only
-    G_trns = G.copy()
+# shift every node so x_0,y_0 becomes the origin; inplace=True skips copying a graph the caller owns
+def translate_graph(G:MultiDiGraph,x_0:float,y_0:float,inplace=False)->MultiDiGraph:  #networks use only
+    G_trns = G if inplace else G.copy()
     G_trns.graph['x_0'] = x_0
     G_trns.graph['y_0'] = y_0
-    for node in G_trns.nodes():
-        G_trns.nodes[node]['x'] -= x_0
-        G_trns.nodes[node]['y'] -= y_0
+    for _, d in G_trns.nodes(data=True):
+        d['x'] -= x_0
+        d['y'] -= y_0
     return G_trns
 
-def transform_gdf(gdf:GeoDataFrame,x_0=None, y_0=None)->tuple:
+# project GeoDataFrame (into to_crs if given) and translate it to x_0,y_0 as the new origin
+def transform_gdf(gdf:GeoDataFrame,x_0=None, y_0=None, to_crs=None)->tuple:
     if len(gdf['geometry']) != 0:
-        gdf_proj = project_gdf(gdf)
+        gdf_proj = project_gdf(gdf, to_crs=to_crs)
         gdf_trns = translate_gdf(gdf_proj,x_0,y_0)
         return gdf_trns
     else:
         print("GeoDataFrame must have a valid CRS and cannot be empty")
         return gdf
     
-def transform_graph(G:MultiDiGraph,x_0:float, y_0:float)->tuple:  #networks use only
-    G_proj = project_graph(G)
-    G_trns = translate_graph(G_proj,x_0,y_0)
+def transform_graph(G:MultiDiGraph,x_0:float, y_0:float, to_crs=None)->tuple:  #networks use only
+    G_proj = project_graph(G, to_crs=to_crs)
+    G_trns = translate_graph(G_proj,x_0,y_0,inplace=True)
     return G_trns
         
\ No newline at end of file